@@ -69,6 +69,7 @@ class Constants:
     TEMP_PSL_DIRNAME = "temp_lastz_psl_output"
     TEMP_CAT_DIRNAME = "temp_concat_lastz_output"
     CHAIN_JOBLIST_FILENAME = "chains_joblist"
+    JOBLIST_WRITE_BUFFER_SIZE = 1 << 20  # 1 MiB
 
     TEMP_AXT_CHAIN_DIRNAME = "temp_chain_run"
     SORTED_PSL_DIRNAME = "sorted_psl"
@@ -97,6 +98,8 @@ class Constants:
 
     KENT_BINARIES_DIRNAME = "HL_kent_binaries"
     CHAIN_CLEAN_MICRO_ENV = "chain_clean_micro_env"
+    # chainCleaner always exits with non-zero code on macOS: ignored only if this env var is set
+    IGNORE_MACOS_CHAIN_CLEANER_EXIT_ENV = "MAKE_CHAINS_IGNORE_MACOS_CHAINCLEANER_EXIT"
 
     class NextflowConstants:
         SCRIPT_LOCATION = os.path.abspath(os.path.dirname(__file__))
@@ -128,6 +131,8 @@ class Constants:
         LASTZ = "lastz"
         # very special but necessary executable
         NEXTFLOW = "nextflow"
+        # optional, gzip is used if not available
+        PIGZ = "pigz"
 
     class ScriptNames:
         REPEAT_FILLER = "chain_gap_filler.py"
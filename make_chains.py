@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 """Make LASTZ chains master script."""
 import argparse
+import functools
 import shutil
 import sys
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed
 from datetime import datetime as dt
 from constants import Constants
 from modules.step_executables import StepExecutables
@@ -12,6 +15,7 @@ from modules.project_paths import ProjectPaths
 from modules.project_directory import OutputDirectoryManager
 from modules.step_manager import StepManager
 from modules.parameters import PipelineParameters
+from modules.parameters import PipelineArgs
 from modules.pipeline_steps import PipelineSteps
 from modules.make_chains_logging import setup_logger
 from modules.make_chains_logging import to_log
@@ -24,7 +28,8 @@ __maintainer__ = "Bogdan M. Kirilenko"
 SCRIPT_LOCATION = os.path.abspath(os.path.dirname(__file__))
 
 
-def parse_args():
+@functools.lru_cache(maxsize=1)
+def build_arg_parser():
     app = argparse.ArgumentParser(description=Constants.DESCRIPTION)
     app.add_argument(
         "target_name", help="Target genome identifier, e.g. hg38, human, etc."
@@ -83,57 +88,12 @@ def parse_args():
     pipeline_params.add_argument("--skip_fill_unmask", dest="skip_fill_unmask", action="store_true")
     pipeline_params.add_argument("--skip_clean_chain", dest="skip_clean_chain", action="store_true")
 
-    pipeline_params.add_argument("--lastz_y", default=Constants.DEFAULT_LASTZ_Y, type=int)
-    pipeline_params.add_argument("--lastz_h", default=Constants.DEFAULT_LASTZ_H, type=int)
-    pipeline_params.add_argument("--lastz_l", default=Constants.DEFAULT_LASTZ_L, type=int)
-    pipeline_params.add_argument("--lastz_k", default=Constants.DEFAULT_LASTZ_K, type=int)
-    pipeline_params.add_argument("--seq1_chunk", default=Constants.DEFAULT_SEQ1_CHUNK, type=int)
-    pipeline_params.add_argument("--seq1_lap", default=Constants.DEFAULT_SEQ1_LAP, type=int)
-    pipeline_params.add_argument("--seq1_limit", default=Constants.DEFAULT_SEQ1_LIMIT, type=int)
-    pipeline_params.add_argument("--seq2_chunk", default=Constants.DEFAULT_SEQ2_CHUNK, type=int)
-    pipeline_params.add_argument("--seq2_lap", default=Constants.DEFAULT_SEQ2_LAP, type=int)
-    pipeline_params.add_argument("--seq2_limit", default=Constants.DEFAULT_SEQ2_LIMIT, type=int)
-    pipeline_params.add_argument("--min_chain_score",
-                                 default=Constants.DEFAULT_MIN_CHAIN_SCORE,
-                                 type=int)
-    pipeline_params.add_argument("--chain_linear_gap",
-                                 default=Constants.DEFAULT_CHAIN_LINEAR_GAP,
-                                 choices=["loose", "medium"],
-                                 type=str)
-    pipeline_params.add_argument("--num_fill_jobs", default=Constants.DEFAULT_NUM_FILL_JOBS, type=int)
-    pipeline_params.add_argument("--fill_chain_min_score",
-                                 default=Constants.DEFAULT_FILL_CHAIN_MIN_SCORE,
-                                 type=int)
-    pipeline_params.add_argument("--fill_insert_chain_min_score",
-                                 default=Constants.DEFAULT_INSERT_CHAIN_MIN_SCORE,
-                                 type=int)
-    pipeline_params.add_argument("--fill_gap_max_size_t",
-                                 default=Constants.DEFAULT_FILL_GAP_MAX_SIZE_T,
-                                 type=int)
-    pipeline_params.add_argument("--fill_gap_max_size_q",
-                                 default=Constants.DEFAULT_FILL_GAP_MAX_SIZE_Q,
-                                 type=int)
-    pipeline_params.add_argument("--fill_gap_min_size_t",
-                                 default=Constants.DEFAULT_FILL_GAP_MIN_SIZE_T,
-                                 type=int)
-    pipeline_params.add_argument("--fill_gap_min_size_q",
-                                 default=Constants.DEFAULT_FILL_GAP_MIN_SIZE_Q,
-                                 type=int)
-    pipeline_params.add_argument("--fill_lastz_k", default=Constants.DEFAULT_FILL_LASTZ_K, type=int)
-    pipeline_params.add_argument("--fill_lastz_l", default=Constants.DEFAULT_FILL_LASTZ_L, type=int)
-    pipeline_params.add_argument("--fill_memory", default=Constants.DEFAULT_FILL_MEMORY, type=int)
-    pipeline_params.add_argument("--fill_prepare_memory",
-                                 default=Constants.DEFAULT_FILL_PREPARE_MEMORY,
-                                 type=int)
-    pipeline_params.add_argument("--chaining_memory",
-                                 default=Constants.DEFAULT_CHAINING_MEMORY,
-                                 type=int)
-    pipeline_params.add_argument("--chain_clean_memory",
-                                 default=Constants.DEFAULT_CHAIN_CLEAN_MEMORY,
-                                 type=int)
-    pipeline_params.add_argument("--clean_chain_parameters",
-                                 default=Constants.DEFAULT_CLEAN_CHAIN_PARAMS)
+    PipelineArgs.add_to_parser(pipeline_params)
+    return app
+
 
+def parse_args():
+    app = build_arg_parser()
     if len(sys.argv) < 5:
         app.print_help()
         sys.exit(1)
@@ -142,20 +102,29 @@ def parse_args():
     return args
 
 
-def log_version():
+@functools.lru_cache(maxsize=1)
+def get_git_revision():
     """Get git hash and current branch if possible."""
-    cmd_hash = "git rev-parse HEAD"
-    cmd_branch = "git rev-parse --abbrev-ref HEAD"
+    # .git is a directory in a regular clone and a file in a worktree
+    if not os.path.exists(os.path.join(SCRIPT_LOCATION, ".git")):
+        return "unknown", "unknown"
+    # one call returns both: the hash and then the abbreviated branch name
+    cmd = ["git", "rev-parse", "HEAD", "--abbrev-ref", "HEAD"]
     try:
-        git_hash = subprocess.check_output(
-            cmd_hash, shell=True, cwd=SCRIPT_LOCATION
-        ).decode("utf-8").strip()
-        git_branch = subprocess.check_output(
-            cmd_branch, shell=True, cwd=SCRIPT_LOCATION
-        ).decode("utf-8").strip()
-    except subprocess.CalledProcessError:
-        git_hash = "unknown"
-        git_branch = "unknown"
+        git_output = subprocess.check_output(
+            cmd, cwd=SCRIPT_LOCATION, stderr=subprocess.DEVNULL
+        ).decode("utf-8").split()
+    except (subprocess.CalledProcessError, FileNotFoundError):
+        return "unknown", "unknown"
+    if len(git_output) != 2:
+        return "unknown", "unknown"
+    git_hash, git_branch = git_output
+    return git_hash, git_branch
+
+
+def log_version():
+    """Log pipeline version, git hash and current branch."""
+    git_hash, git_branch = get_git_revision()
     version = f"Version {__version__}\nCommit: {git_hash}\nBranch: {git_branch}\n"
     to_log("# Make Lastz Chains #")
     to_log(version)
@@ -230,18 +199,30 @@ def run_pipeline(args):
     parameters.dump_to_json(project_dir)
 
     # initiate input files
-    setup_genome_sequences(args.target_genome,
-                           args.target_name,
-                           Constants.TARGET_LABEL,
-                           project_paths,
-                           step_executables,
-                           parameters)
-    setup_genome_sequences(args.query_genome,
-                           args.query_name,
-                           Constants.QUERY_LABEL,
-                           project_paths,
-                           step_executables,
-                           parameters)
+    # target and query are independent: set them up concurrently
+    executor = ThreadPoolExecutor(max_workers=2)
+    genome_setups = [
+        executor.submit(setup_genome_sequences,
+                        args.target_genome,
+                        args.target_name,
+                        Constants.TARGET_LABEL,
+                        project_paths,
+                        step_executables,
+                        parameters),
+        executor.submit(setup_genome_sequences,
+                        args.query_genome,
+                        args.query_name,
+                        Constants.QUERY_LABEL,
+                        project_paths,
+                        step_executables,
+                        parameters),
+    ]
+    try:
+        # raise the first error right away, do not wait for the other genome
+        for genome_setup in as_completed(genome_setups):
+            genome_setup.result()
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
 
     # now execute steps
     step_manager.execute_steps(parameters, step_executables, project_paths)
@@ -5,6 +5,7 @@ from dataclasses import dataclass
 from modules.make_chains_logging import to_log
 from constants import Constants
 from modules.error_classes import PipelineFileNotFoundError
+from modules.cpu_detection import get_cpu_count
 
 
 @dataclass
@@ -59,3 +60,10 @@ def check_expected_file(path, label):
         f"The failed operation label is: {label}"
     )
     raise PipelineFileNotFoundError(err_msg)
+
+
+def get_compress_cmd(pigz_executable):
+    """Command to gzip stdin to stdout: pigz if available, gzip otherwise."""
+    if pigz_executable:
+        return [pigz_executable, "-c", "-p", str(get_cpu_count())]
+    return ["gzip", "-c"]
@@ -0,0 +1,43 @@
+"""Detect the number of CPUs actually available to the pipeline."""
+import math
+import os
+
+CGROUP_V2_CPU_MAX = "/sys/fs/cgroup/cpu.max"
+CGROUP_V1_CPU_QUOTA = "/sys/fs/cgroup/cpu/cpu.cfs_quota_us"
+CGROUP_V1_CPU_PERIOD = "/sys/fs/cgroup/cpu/cpu.cfs_period_us"
+
+
+def _read_cgroup_cpu_limit():
+    """Get CPU limit from the cgroup quota, None if there is no limit."""
+    try:
+        if os.path.isfile(CGROUP_V2_CPU_MAX):
+            with open(CGROUP_V2_CPU_MAX, "r") as f:
+                quota, period = f.read().split()[:2]
+            if quota == "max":
+                return None
+        else:
+            with open(CGROUP_V1_CPU_QUOTA, "r") as f:
+                quota = f.read().strip()
+            with open(CGROUP_V1_CPU_PERIOD, "r") as f:
+                period = f.read().strip()
+        quota, period = int(quota), int(period)
+    except (OSError, ValueError):
+        return None
+    if quota <= 0 or period <= 0:  # -1 in cgroup v1 means no limit
+        return None
+    return max(1, math.ceil(quota / period))
+
+
+def get_cpu_count():
+    """Get the number of CPUs this process may use.
+
+    Unlike os.cpu_count(), respects the CPU affinity mask (taskset, Slurm)
+    and the cgroup CPU quota (Docker, Kubernetes)."""
+    if hasattr(os, "sched_getaffinity"):
+        cpu_count = len(os.sched_getaffinity(0))
+    else:
+        cpu_count = os.cpu_count() or 1
+    cgroup_limit = _read_cgroup_cpu_limit()
+    if cgroup_limit is not None:
+        cpu_count = min(cpu_count, cgroup_limit)
+    return cpu_count
@@ -1,10 +1,57 @@
 """Class to manage pipeline parameters."""
 import os
 import json
+from dataclasses import dataclass
+from dataclasses import field
+from dataclasses import fields
 from constants import Constants as Const
 from modules.make_chains_logging import to_log
 
 
+@dataclass
+class PipelineArgs:
+    """Command line pipeline parameters and their defaults.
+
+    Each field becomes a --{field name} argument; extra argparse
+    keyword arguments (e.g. choices) are stored in the field metadata."""
+    lastz_y: int = Const.DEFAULT_LASTZ_Y
+    lastz_h: int = Const.DEFAULT_LASTZ_H
+    lastz_l: int = Const.DEFAULT_LASTZ_L
+    lastz_k: int = Const.DEFAULT_LASTZ_K
+    seq1_chunk: int = Const.DEFAULT_SEQ1_CHUNK
+    seq1_lap: int = Const.DEFAULT_SEQ1_LAP
+    seq1_limit: int = Const.DEFAULT_SEQ1_LIMIT
+    seq2_chunk: int = Const.DEFAULT_SEQ2_CHUNK
+    seq2_lap: int = Const.DEFAULT_SEQ2_LAP
+    seq2_limit: int = Const.DEFAULT_SEQ2_LIMIT
+    min_chain_score: int = Const.DEFAULT_MIN_CHAIN_SCORE
+    chain_linear_gap: str = field(default=Const.DEFAULT_CHAIN_LINEAR_GAP,
+                                  metadata={"choices": ["loose", "medium"]})
+    num_fill_jobs: int = Const.DEFAULT_NUM_FILL_JOBS
+    fill_chain_min_score: int = Const.DEFAULT_FILL_CHAIN_MIN_SCORE
+    fill_insert_chain_min_score: int = Const.DEFAULT_INSERT_CHAIN_MIN_SCORE
+    fill_gap_max_size_t: int = Const.DEFAULT_FILL_GAP_MAX_SIZE_T
+    fill_gap_max_size_q: int = Const.DEFAULT_FILL_GAP_MAX_SIZE_Q
+    fill_gap_min_size_t: int = Const.DEFAULT_FILL_GAP_MIN_SIZE_T
+    fill_gap_min_size_q: int = Const.DEFAULT_FILL_GAP_MIN_SIZE_Q
+    fill_lastz_k: int = Const.DEFAULT_FILL_LASTZ_K
+    fill_lastz_l: int = Const.DEFAULT_FILL_LASTZ_L
+    fill_memory: int = Const.DEFAULT_FILL_MEMORY
+    fill_prepare_memory: int = Const.DEFAULT_FILL_PREPARE_MEMORY
+    chaining_memory: int = Const.DEFAULT_CHAINING_MEMORY
+    chain_clean_memory: int = Const.DEFAULT_CHAIN_CLEAN_MEMORY
+    clean_chain_parameters: str = Const.DEFAULT_CLEAN_CHAIN_PARAMS
+
+    @classmethod
+    def add_to_parser(cls, parser):
+        """Add an argument for each field to the (argparse) parser or group."""
+        for arg_field in fields(cls):
+            parser.add_argument(f"--{arg_field.name}",
+                                default=arg_field.default,
+                                type=arg_field.type,
+                                **arg_field.metadata)
+
+
 class PipelineParameters:
     def __init__(self, args):
         self.target_name = args.target_name
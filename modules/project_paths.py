@@ -23,8 +23,6 @@ class ProjectPaths:
         self.target_chrom_rename_table = None
         self.query_chrom_rename_table = None
 
-        self.hl_kent_binaries = self._j_abs(root_dir, Constants.KENT_BINARIES_DIRNAME)
-        self.chain_clean_micro_env = self._j_abs(root_dir, Constants.CHAIN_CLEAN_MICRO_ENV)
         self.kent_temp_dir = self._j_abs(project_dir, Constants.KENT_TEMP_DIRNAME)
 
         # LASTZ step
@@ -2,8 +2,7 @@
 import sys
 import os
 import subprocess
-from twobitreader import TwoBitFile
-from twobitreader import TwoBitFileError
+import py2bit
 from modules.make_chains_logging import to_log
 from constants import Constants
 from modules.project_paths import ProjectPaths
@@ -12,14 +11,26 @@ from modules.make_chains_logging import to_log
 from modules.parameters import PipelineParameters
 
 
+TWO_BIT_SIGNATURE = 0x1A412743
+
+
 def check_if_twobit(genome_seq_file):
-    try:
-        two_bit_reader = TwoBitFile(genome_seq_file)
-        del two_bit_reader
-        return True
-    except TwoBitFileError:
-        # not a twobit, likely a fasta
+    # 2bit files start with a signature, written in either byte order
+    # if it is absent: not a twobit, likely a fasta
+    with open(genome_seq_file, "rb") as f:
+        magic = f.read(4)
+    if len(magic) < 4:
         return False
+    return TWO_BIT_SIGNATURE in (int.from_bytes(magic, "little"), int.from_bytes(magic, "big"))
+
+
+def read_two_bit_chrom_sizes(two_bit_file):
+    """Get chrom: size dict from a 2bit file (a single call to the UCSC C library)."""
+    two_bit_reader = py2bit.open(two_bit_file)
+    try:
+        return two_bit_reader.chroms()
+    finally:
+        two_bit_reader.close()
 
 
 def check_and_fix_chrom_names(chrom_names, path):
@@ -79,11 +90,13 @@ def call_convert_format_subprocess(cmd, input_path):
         sys.exit(1)
 
 
-def rename_chrom_names_fasta(genome_seq_file, tmp_dir, genome_id, invalid_chrom_names):
+def rename_chrom_names_fasta(genome_seq_file, tmp_dir, genome_id, label, invalid_chrom_names):
     """Rename chrom names in fasta, save it to tmp dir, create rename table."""
     # specify output fasta and table paths, open in and out fasta
-    renamed_fasta_path = os.path.join(tmp_dir, f"{genome_id}_renamed_chrom.fa")
-    rename_table = os.path.join(tmp_dir, f"{genome_id}_chrom_rename_table.tsv")
+    # label in the filenames: target and query are set up concurrently
+    # and may share the genome ID (e.g. self-alignment)
+    renamed_fasta_path = os.path.join(tmp_dir, f"{label}_{genome_id}_renamed_chrom.fa")
+    rename_table = os.path.join(tmp_dir, f"{label}_{genome_id}_chrom_rename_table.tsv")
     out_f = open(renamed_fasta_path, "w")
     in_f = open(genome_seq_file, "r")
     # create new fasta with renamed chroms
@@ -143,8 +156,7 @@ def setup_genome_sequences(genome_seq_file: str,
         # two bit -> if chrom names are intact, just use this file without
         # creating any intermediate files
         # otherwise, create intermediate fasta with fixed chrom names
-        two_bit_reader = TwoBitFile(genome_seq_file)
-        two_bit_chrom_names = list(two_bit_reader.sequence_sizes().keys())
+        two_bit_chrom_names = list(read_two_bit_chrom_sizes(genome_seq_file).keys())
         invalid_chrom_names = check_and_fix_chrom_names(
             two_bit_chrom_names, genome_seq_file
         )
@@ -153,12 +165,12 @@ def setup_genome_sequences(genome_seq_file: str,
             # there are invalid chrom names, that need to be renamed
             # (1) create intermediate fasta and rename chromosomes there
             to_log(f"Detected {len(invalid_chrom_names)} invalid chrom names in the input 2bit file")
-            fasta_dump_path = os.path.join(project_paths.project_dir, f"TEMP_{genome_id}_genome_dump.fa")
+            fasta_dump_path = os.path.join(project_paths.project_dir, f"TEMP_{label}_{genome_id}_genome_dump.fa")
             two_bit_to_fa_cmd = [executables.two_bit_to_fa, genome_seq_file, fasta_dump_path]
             call_convert_format_subprocess(two_bit_to_fa_cmd, genome_seq_file)
             to_log(f"Saving intermediate fasta to {fasta_dump_path}")
             fixed_fasta_file, chrom_rename_table_path = rename_chrom_names_fasta(
-                fasta_dump_path, project_paths.project_dir, genome_id, invalid_chrom_names
+                fasta_dump_path, project_paths.project_dir, genome_id, label, invalid_chrom_names
             )
             os.remove(fasta_dump_path)
             # (2) create 2bit with renamed sequences
@@ -180,7 +192,7 @@ def setup_genome_sequences(genome_seq_file: str,
             # create rename table -> to track chrom name changes
             # update genomes seq file then -> use it as src to create twobit
             genome_seq_file, chrom_rename_table_path = rename_chrom_names_fasta(
-                genome_seq_file, project_paths.project_dir, genome_id, invalid_chrom_names
+                genome_seq_file, project_paths.project_dir, genome_id, label, invalid_chrom_names
             )
 
         two_bit_to_fa_cmd = [executables.fa_to_two_bit, genome_seq_file, seq_dir]
@@ -192,8 +204,7 @@ def setup_genome_sequences(genome_seq_file: str,
     chrom_sizes_path = os.path.join(project_paths.project_dir, chrom_sizes_filename)
 
     # must be without errors now
-    two_bit_reader = TwoBitFile(seq_dir)
-    twobit_seq_to_size = two_bit_reader.sequence_sizes()
+    twobit_seq_to_size = read_two_bit_chrom_sizes(seq_dir)
 
     f = open(chrom_sizes_path, "w")
     for k, v in twobit_seq_to_size.items():
@@ -1,6 +1,7 @@
 """Class that holds paths to all necessary executables."""
 import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from constants import Constants
 from modules.error_classes import ExecutableNotFoundError
 from modules.make_chains_logging import to_log
@@ -12,25 +13,49 @@ class StepExecutables:
         self.hl_kent_binaries_path = os.path.join(root_dir, Constants.KENT_BINARIES_DIRNAME)
         self.chain_clean_env_dir = os.path.join(root_dir, Constants.CHAIN_CLEAN_MICRO_ENV)
         self.not_found = []
+        # some Kent binaries and NetFilterNonNested.perl are necessary to run chainCleaner
+        # computed once here: no need to copy os.environ for each call
+        self.chain_clean_env = {
+            **os.environ,
+            "PATH": f"{self.hl_kent_binaries_path}{os.pathsep}{os.environ.get('PATH', '')}"
+        }
 
         self.lastz_wrapper = self.__find_script(Constants.ScriptNames.RUN_LASTZ)
         self.lastz_layer = self.__find_script(Constants.ScriptNames.RUN_LASTZ_LAYER)
         self.repeat_filler = self.__find_script(Constants.ScriptNames.REPEAT_FILLER)
 
-        self.fa_to_two_bit = self.__find_binary(Constants.ToolNames.FA_TO_TWO_BIT)
-        self.two_bit_to_fa = self.__find_binary(Constants.ToolNames.TWO_BIT_TO_FA)
-        self.psl_sort_acc = self.__find_binary(Constants.ToolNames.PSL_SORT_ACC)
-        self.axt_chain = self.__find_binary(Constants.ToolNames.AXT_CHAIN)
-        self.axt_to_psl = self.__find_binary(Constants.ToolNames.AXT_TO_PSL)
-        self.chain_anti_repeat = self.__find_binary(Constants.ToolNames.CHAIN_ANTI_REPEAT)
-        self.chain_merge_sort = self.__find_binary(Constants.ToolNames.CHAIN_MERGE_SORT)
-        self.chain_cleaner = self.__find_binary(Constants.ToolNames.CHAIN_CLEANER)
-        self.chain_sort = self.__find_binary(Constants.ToolNames.CHAIN_SORT)
-        self.chain_score = self.__find_binary(Constants.ToolNames.CHAIN_SCORE)
-        self.chain_net = self.__find_binary(Constants.ToolNames.CHAIN_NET)
-        self.chain_filter = self.__find_binary(Constants.ToolNames.CHAIN_FILTER)
-        self.lastz = self.__find_binary(Constants.ToolNames.LASTZ, predef_arg=args.lastz_executable)
-        self.nextflow = self.__find_binary(Constants.ToolNames.NEXTFLOW, predef_arg=args.nextflow_executable)
+        # each lookup walks the whole $PATH: run them concurrently
+        binaries_to_find = {
+            "fa_to_two_bit": (Constants.ToolNames.FA_TO_TWO_BIT, None),
+            "two_bit_to_fa": (Constants.ToolNames.TWO_BIT_TO_FA, None),
+            "psl_sort_acc": (Constants.ToolNames.PSL_SORT_ACC, None),
+            "axt_chain": (Constants.ToolNames.AXT_CHAIN, None),
+            "axt_to_psl": (Constants.ToolNames.AXT_TO_PSL, None),
+            "chain_anti_repeat": (Constants.ToolNames.CHAIN_ANTI_REPEAT, None),
+            "chain_merge_sort": (Constants.ToolNames.CHAIN_MERGE_SORT, None),
+            "chain_cleaner": (Constants.ToolNames.CHAIN_CLEANER, None),
+            "chain_sort": (Constants.ToolNames.CHAIN_SORT, None),
+            "chain_score": (Constants.ToolNames.CHAIN_SCORE, None),
+            "chain_net": (Constants.ToolNames.CHAIN_NET, None),
+            "chain_filter": (Constants.ToolNames.CHAIN_FILTER, None),
+            "lastz": (Constants.ToolNames.LASTZ, args.lastz_executable),
+            "nextflow": (Constants.ToolNames.NEXTFLOW, args.nextflow_executable),
+        }
+        # workers only look the binaries up, results are logged and collected
+        # here in the fixed order of binaries_to_find
+        with ThreadPoolExecutor(max_workers=len(binaries_to_find)) as executor:
+            found_paths = list(executor.map(lambda item: (item[0], self.__find_binary(*item[1])),
+                                            binaries_to_find.items()))
+        for attr_name, binary_path in found_paths:
+            binary_name, predef_arg = binaries_to_find[attr_name]
+            if binary_path is None:
+                self.not_found.append(binary_name)
+            elif predef_arg:
+                to_log(f"* using {binary_name} manually located at {binary_path}")
+            else:
+                to_log(f"* found {binary_name} at {binary_path}")
+            setattr(self, attr_name, binary_path)
+        self.pigz = self.__find_optional_binary(Constants.ToolNames.PIGZ)
 
         self.__check_completeness()
 
@@ -44,12 +69,9 @@ class StepExecutables:
         return abs_path
 
     def __find_binary(self, binary_name, predef_arg=None):
+        """Return path to the binary or None; safe to call from several threads."""
         if predef_arg:
-            if not os.path.isfile(predef_arg):
-                self.not_found.append(binary_name)
-                return
-            to_log(f"* using {binary_name} manually located at {binary_name}")
-            return predef_arg
+            return predef_arg if os.path.isfile(predef_arg) else None
         binary_path = shutil.which(binary_name)
 
         if binary_path is None:  # not in $PATH
@@ -57,8 +79,15 @@ class StepExecutables:
             binary_path = os.path.join(self.hl_kent_binaries_path, binary_name)
 
             if not os.path.exists(binary_path):
-                self.not_found.append(binary_name)
-                return
+                return None
+        return binary_path
+
+    @staticmethod
+    def __find_optional_binary(binary_name):
+        binary_path = shutil.which(binary_name)
+        if binary_path is None:
+            to_log(f"* optional {binary_name} not found, using fallback")
+            return None
         to_log(f"* found {binary_name} at {binary_path}")
         return binary_path
 
@@ -5,6 +5,7 @@ import subprocess
 from constants import Constants
 from modules.make_chains_logging import to_log
 from modules.error_classes import NextflowProcessError
+from modules.cpu_detection import get_cpu_count
 
 
 class NextflowConfig:
@@ -19,6 +20,8 @@ class NextflowConfig:
         self.cpus = 1  # always a fixed number
         self.config_path = None
         self.queue_size = Constants.NextflowConstants.DEFAULT_QUEUE_SIZE
+        # local executor: do not use more CPUs than available (affinity mask, cgroup quota)
+        self.local_cpus = get_cpu_count() if self.executor == "local" else None
 
     def dump_to_file(self):
         """Write the respective config file,"""
@@ -33,6 +36,8 @@ class NextflowConfig:
         if self.queue:
             f.write(f"process.queue = '{self.queue}'\n")
         f.write(f"executor.queueSize = '{self.queue_size}'\n")
+        if self.local_cpus:
+            f.write(f"executor.cpus = '{self.local_cpus}'\n")
         f.close()
         return self.config_path
 
@@ -68,12 +73,16 @@ class NextflowWrapper:
 
         # create the nextflow process
         self.config_file = config_instance.dump_to_file()
-        cmd = f"{self.nextflow_exec} {self.nf_master_script} --joblist {joblist_path} -c {self.config_file}"
+        cmd = [self.nextflow_exec,
+               self.nf_master_script,
+               "--joblist",
+               joblist_path,
+               "-c",
+               self.config_file]
 
         os.makedirs(self.execute_dir, exist_ok=True)
-        to_log(f"Parallel manager: pushing job {cmd}")
+        to_log(f"Parallel manager: pushing job {' '.join(cmd)}")
         self._process = subprocess.Popen(cmd,
-                                         shell=True,
                                          # stdout=log_file,
                                          # stderr=log_file,
                                          cwd=self.execute_dir)
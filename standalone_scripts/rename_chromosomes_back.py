@@ -8,7 +8,8 @@ If this is the case, the pipeline renames the chromosomes and produces a raname
 This script can rename chromosomes in a resulting chain file based on
 the created rename table.
 
-It is placed in the project directory root under a $genomeID_chrom_rename_table.tsv name.
+It is placed in the project directory root under a ${label}_${genomeID}_chrom_rename_table.tsv name,
+where label is either target or query.
 """
 import argparse
 import sys
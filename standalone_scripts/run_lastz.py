@@ -12,7 +12,7 @@ import shutil
 import string
 import random
 import json
-from twobitreader import TwoBitFile
+import py2bit
 
 __author__ = "Bogdan M. Kirilenko"
 
@@ -261,8 +261,10 @@ def parse_seq_arg(arg, tmp_dir, v):
         path = path_specs_split[0]
         chrom = path_specs_split[1]
         # extract the chrom sequence from 2bit
-        two_bit_conn = TwoBitFile(path)
-        chrom_seq = two_bit_conn[chrom]
+        # keep soft-masking (lowercase) in the extracted sequence
+        two_bit_conn = py2bit.open(path, True)
+        chrom_seq = two_bit_conn.sequence(chrom)
+        two_bit_conn.close()
         f.write(f">{chrom}\n{chrom_seq}\n")
     f.close()
     return fasta_path
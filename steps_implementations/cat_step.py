@@ -1,7 +1,7 @@
 """Cat step implementation."""
 import os
-import gzip
 import shutil
+import subprocess
 
 from constants import Constants
 from modules.parameters import PipelineParameters
@@ -9,7 +9,9 @@ from modules.project_paths import ProjectPaths
 from modules.step_executables import StepExecutables
 from modules.make_chains_logging import to_log
 from modules.common import has_non_empty_file
+from modules.common import get_compress_cmd
 from modules.error_classes import PipelineFileNotFoundError
+from modules.error_classes import PipelineSubprocessError
 
 
 def do_cat(params: PipelineParameters,
@@ -24,6 +26,7 @@ def do_cat(params: PipelineParameters,
     if num_lastz_buckets == 0:
         raise PipelineFileNotFoundError("Found no lastz output buckets!")
     to_log(f"Concatenating LASTZ output from {len(lastz_output_buckets)} buckets")
+    gzip_cmd = get_compress_cmd(executables.pigz)
     # 2. Combine each bucket separately
     for num, bucket in enumerate(lastz_output_buckets):
         bucket_location = os.path.join(project_paths.lastz_output_dir, bucket)
@@ -38,13 +41,28 @@ def do_cat(params: PipelineParameters,
         psl_files = [os.path.join(bucket_location, psl) for psl in filenames_to_concat]
         concatenated_paths.append(output_filename)
         # concatenate files into the bucket
-        with gzip.open(output_filename, 'wt') as out_f:
-            for psl_file in psl_files:
-                with open(psl_file, "r") as in_f:
-                    for line in in_f:
-                        if "#" in line:
-                            continue
-                        out_f.write(line)
+        # compression runs in a separate process (pigz: multithreaded)
+        with open(output_filename, "wb") as out_f:
+            gzip_process = subprocess.Popen(gzip_cmd, stdin=subprocess.PIPE, stdout=out_f)
+            try:
+                for psl_file in psl_files:
+                    with open(psl_file, "rb") as in_f:
+                        for line in in_f:
+                            if b"#" in line:
+                                continue
+                            gzip_process.stdin.write(line)
+            except BrokenPipeError:
+                pass  # the compressor died: its exit code is reported below
+            finally:
+                try:
+                    gzip_process.stdin.close()
+                except BrokenPipeError:
+                    pass
+                gzip_exit_code = gzip_process.wait()
+        if gzip_exit_code != 0:
+            # do not leave a half-written bucket behind
+            os.remove(output_filename) if os.path.isfile(output_filename) else None
+            raise PipelineSubprocessError(f"{gzip_cmd[0]} failed with exit code {gzip_exit_code}")
         # concatenation end
         to_log(f"* concatenated bucket {bucket} to {output_filename}")
 
@@ -2,7 +2,10 @@
 """Direct translation from bundleChromSplitPSLfiles.perl to Python."""
 import os
 import sys
+import shutil
+from concurrent.futures import ThreadPoolExecutor
 from modules.common import read_chrom_sizes
+from modules.cpu_detection import get_cpu_count
 from modules.make_chains_logging import to_log
 
 
@@ -18,6 +21,9 @@ def bundle_files(args, chrom_size, input_files):
     bundle_psl_file_count = 0
     cur_bundle_count = 0
     input_dir = args["input_dir"]
+    # which files go to which bundle depends on the preceding bundles,
+    # so plan bundles first and then write them in parallel
+    bundles_to_write = []
 
     for chrom in sorted(chrom_size, key=chrom_size.get, reverse=True):
         if args["verbose"]:
@@ -36,24 +42,31 @@ def bundle_files(args, chrom_size, input_files):
             to_log(f"curBases: {cur_bases}  num files: {bundle_psl_file_count} {bundle_psl_file_list}")
 
         if cur_bases >= args["max_bases"] or bundle_psl_file_count > 1000:
-            execute_bundle(args, bundle_psl_file_list, cur_bundle_count)
+            bundles_to_write.append((bundle_psl_file_list, cur_bundle_count))
             cur_bundle_count += 1
             cur_bases = 0
             bundle_psl_file_list = []
             bundle_psl_file_count = 0
 
-    execute_bundle(args, bundle_psl_file_list, cur_bundle_count) if cur_bases > 0 else None
+    bundles_to_write.append((bundle_psl_file_list, cur_bundle_count)) if cur_bases > 0 else None
     cur_bundle_count += 1
+
+    # bundles are independent: writing them is I/O bound, threads are enough
+    with ThreadPoolExecutor(max_workers=get_cpu_count()) as executor:
+        futures = [executor.submit(execute_bundle, args, file_list, bundle_num)
+                   for file_list, bundle_num in bundles_to_write]
+        for future in futures:
+            future.result()  # re-raise errors, if any
     return cur_bundle_count
 
 
 def execute_bundle(args, bundle_psl_file_list, cur_bundle_count):
     output_dir = args["output_dir"]
     output_file_path = f"{output_dir}/bundle.{cur_bundle_count}.psl"
-    with open(output_file_path, 'w') as outfile:
+    with open(output_file_path, 'wb') as outfile:
         for file_path in bundle_psl_file_list:
-            with open(file_path, 'r') as infile:
-                outfile.write(infile.read())
+            with open(file_path, 'rb') as infile:
+                shutil.copyfileobj(infile, outfile)
     to_log(f"Written to {output_file_path}")
 
 
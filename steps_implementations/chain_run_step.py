@@ -1,5 +1,6 @@
 """Do Chain Run."""
 import os
+import shlex
 import shutil
 import subprocess
 from parallelization.nextflow_wrapper import execute_nextflow_step
@@ -11,21 +12,41 @@ from modules.parameters import PipelineParameters
 from modules.project_paths import ProjectPaths
 from modules.step_executables import StepExecutables
 from modules.error_classes import PipelineSubprocessError
+from modules.error_classes import PipelineFileNotFoundError
 from modules.common import has_non_empty_file
 
 
+def _check_arg_max(cmd):
+    """Raise an error if cmd does not fit into the system argument list limit."""
+    try:
+        arg_max = os.sysconf("SC_ARG_MAX")
+    except (ValueError, OSError, AttributeError):
+        return  # cannot determine the limit on this system
+    # each argument also costs a pointer and a terminating null byte
+    cmd_size = sum(len(os.fsencode(arg)) + 1 + 8 for arg in cmd)
+    # leave room for the environment, which shares the same limit
+    env_size = sum(len(k) + len(v) + 2 + 8 for k, v in os.environ.items())
+    if cmd_size + env_size >= arg_max:
+        raise PipelineSubprocessError(
+            f"Error! The {cmd[0]} command has {len(cmd)} arguments "
+            f"and exceeds the system ARG_MAX limit ({arg_max} bytes)"
+        )
+
+
 def psl_bundle(cat_out_dirname, project_paths, executables, params):
     # 1.1 -> sort
     concatenated_files = [os.path.join(cat_out_dirname, x) for x in os.listdir(cat_out_dirname)]
-    # seems danger, but on modern systems ARG_MAX is quite large
-    # and the number of concatenated files unlikely exceeds a few thousands
+    # input files are passed as separate argv elements (no shell involved)
+    # the number of concatenated files is usually a few thousands at most,
+    # but check against ARG_MAX to fail with a clear message instead of E2BIG
     sort_cmd = [executables.psl_sort_acc,
                 "nohead",
                 project_paths.sorted_psl_dir,
                 project_paths.kent_temp_dir,
                 *concatenated_files]
-    to_log(f"Sorting PSL files, saving the results to {project_paths.sorted_psl_dir}")
-    to_log(" ".join(sort_cmd))
+    _check_arg_max(sort_cmd)
+    to_log(f"Sorting {len(concatenated_files)} PSL files, saving the results to {project_paths.sorted_psl_dir}")
+    to_log(" ".join(sort_cmd[:4]) + f" <{len(concatenated_files)} files from {cat_out_dirname}>")
 
     sort_process_result = subprocess.run(sort_cmd, stderr=subprocess.PIPE)
     if sort_process_result.returncode != 0:
@@ -35,49 +56,50 @@ def psl_bundle(cat_out_dirname, project_paths, executables, params):
         )
 
     # shutil.rmtree(project_paths.temp_dir_for_psl_sort)
+    # pslSortAcc may exit with 0 but produce nothing: fail before the cluster run
+    has_non_empty_file(project_paths.sorted_psl_dir, "psl_sort")
 
     # 1.2 -> bundle chrom split files
     bundle_chrom_split_psl_files(project_paths.sorted_psl_dir,
                                  params.seq_1_len,
                                  project_paths.split_psl_dir,
                                  Constants.BUNDLE_PSL_MAX_BASES)
+    has_non_empty_file(project_paths.split_psl_dir, "psl_bundle")
     to_log(f"PSL bundle sub-step done")
 
 
 def make_chains_joblist(project_paths: ProjectPaths,
                         params: PipelineParameters,
                         executables: StepExecutables):
-    # Prepare parameters
+    """Yield axtChain jobs, one newline-terminated line per bundled psl file.
+
+    Each job is: bash -o pipefail -c 'axtChain ... | chainAntiRepeat ...'
+    pipefail: do not let chainAntiRepeat mask an axtChain failure."""
     seq1_dir = params.seq_1_dir
     seq2_dir = params.seq_2_dir
     # matrix = params.lastz_q if params.lastz_q else ""
     # matrix = ""
-    min_score = params.chain_min_score
-    linear_gap = params.chain_linear_gap
-    bundle_filenames = os.listdir(project_paths.split_psl_dir)
-    to_log(f"Building axtChain joblist for {len(bundle_filenames)} bundled psl files")
-
-    cluster_jobs = []
-    for bundle_filename in bundle_filenames:
-        in_path = os.path.join(project_paths.split_psl_dir, bundle_filename)
-        out_path = os.path.join(project_paths.chain_output_dir, f"{bundle_filename}.chain")
-        cmd = [executables.axt_chain,
-               "-psl",
-               "-verbose=0",
-               f"-minScore={min_score}",
-               f"-linearGap={linear_gap}",
-               in_path,
-               seq1_dir,
-               seq2_dir,
-               "stdout",
-               "|",
-               executables.chain_anti_repeat,
-               seq1_dir,
-               seq2_dir,
-               "stdin",
-               out_path]
-        cluster_jobs.append(" ".join(cmd))
-    return cluster_jobs
+    # only input and output paths differ between jobs: quote everything else once
+    axt_chain_prefix = shlex.join([executables.axt_chain,
+                                   "-psl",
+                                   "-verbose=0",
+                                   f"-minScore={params.chain_min_score}",
+                                   f"-linearGap={params.chain_linear_gap}"])
+    axt_chain_suffix = shlex.join([seq1_dir, seq2_dir, "stdout"])
+    chain_anti_repeat_prefix = shlex.join([executables.chain_anti_repeat,
+                                           seq1_dir,
+                                           seq2_dir,
+                                           "stdin"])
+
+    # DirEntry objects already hold full paths: no need to join them again
+    with os.scandir(project_paths.split_psl_dir) as entries:
+        for entry in entries:
+            out_path = os.path.join(project_paths.chain_output_dir, f"{entry.name}.chain")
+            piped_cmd = (
+                f"{axt_chain_prefix} {shlex.quote(entry.path)} {axt_chain_suffix} | "
+                f"{chain_anti_repeat_prefix} {shlex.quote(out_path)}"
+            )
+            yield f"bash -o pipefail -c {shlex.quote(piped_cmd)}\n"
 
 
 def do_chain_run(params: PipelineParameters,
@@ -90,10 +112,21 @@ def do_chain_run(params: PipelineParameters,
     chain_jobs = make_chains_joblist(project_paths, params, executables)
 
     # Part 3: execute cluster jobs
-    to_log(f"Saving {len(chain_jobs)} axtChain jobs to {project_paths.chain_joblist_path}")
-    with open(project_paths.chain_joblist_path, "w") as f:
-        f.write("\n".join(chain_jobs))
-        f.write("\n")
+    # jobs are streamed to the file, the whole joblist is never kept in memory
+    # jobs contain file paths: encode them the same way the filesystem does
+    num_chain_jobs = 0
+    with open(project_paths.chain_joblist_path, "wb", buffering=Constants.JOBLIST_WRITE_BUFFER_SIZE) as f:
+        for chain_job in chain_jobs:
+            f.write(os.fsencode(chain_job))
+            num_chain_jobs += 1
+    to_log(f"Saved {num_chain_jobs} axtChain jobs to {project_paths.chain_joblist_path}")
+
+    # backstop for the psl_bundle output check: never submit an empty joblist to nextflow
+    if num_chain_jobs == 0:
+        raise PipelineFileNotFoundError(
+            f"Error! The axtChain joblist {project_paths.chain_joblist_path} is empty: "
+            f"no bundled psl files found at {project_paths.split_psl_dir}"
+        )
 
     execute_nextflow_step(
         executables.nextflow,
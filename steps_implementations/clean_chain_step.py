@@ -3,12 +3,16 @@ import os
 import shutil
 import subprocess
 import platform
+from constants import Constants
 from modules.make_chains_logging import to_log
 from modules.parameters import PipelineParameters
 from modules.project_paths import ProjectPaths
 from modules.step_executables import StepExecutables
 from modules.error_classes import PipelineSubprocessError
 from modules.common import check_expected_file
+from modules.common import get_compress_cmd
+
+IS_MACOS = platform.system() == "Darwin"
 
 
 def do_chains_clean(params: PipelineParameters,
@@ -32,10 +36,6 @@ def do_chains_clean(params: PipelineParameters,
     _intermediate_chain = f"{_output_chain}__temp"
     _clean_chain_args = params.clean_chain_parameters.split()
 
-    # some Kent binaries and NetFilterNonNested.perl are necessary to run chainCleaner
-    _temp_env = os.environ.copy()
-    _temp_env["PATH"] = f"{project_paths.hl_kent_binaries}:" + _temp_env["PATH"]
-
     chain_cleaner_cmd = [
         executables.chain_cleaner,
         project_paths.before_cleaning_chain,
@@ -53,53 +53,73 @@ def do_chains_clean(params: PipelineParameters,
     to_log(" ".join(chain_cleaner_cmd))
 
     with open(project_paths.chain_cleaner_log, 'w') as f:
+        # stdout goes straight to the log file, only stderr is kept in memory
         clean_process = subprocess.Popen(chain_cleaner_cmd,
-                                         stdout=subprocess.PIPE,
+                                         stdout=f,
                                          stderr=subprocess.PIPE,
-                                         env=_temp_env,
+                                         env=executables.chain_clean_env,
                                          text=True)
-        stdout, stderr = clean_process.communicate()
+        _, stderr = clean_process.communicate()
 
-        # Write stdout to log file and also capture it in a variable
-        f.write(stdout)
         # Couldn't open /proc/self/stat , No such file or directory
-        # error on macOS. If this error -> ignore, but crash in case of anything else.
+        # error on macOS: chain cleaner always returns non-zero there.
+        # It can only be ignored explicitly, otherwise real errors would be masked.
         if clean_process.returncode != 0:  # handle error
-            is_macos = platform.system() == "Darwin"
-            if is_macos:
-                # on macOS, it always crashes...
+            ignore_exit_code = os.environ.get(Constants.IGNORE_MACOS_CHAIN_CLEANER_EXIT_ENV)
+            if IS_MACOS and ignore_exit_code:
                 to_log(
-                    "Chain cleaner returned non-zero error code."
-                    "However, you run macOS, where it always return non-zero code."
-                    "It is impossible to differentiate whether it's a true error or now."
+                    "Chain cleaner returned non-zero error code. "
+                    "However, you run macOS, where it always return non-zero code, "
+                    f"and {Constants.IGNORE_MACOS_CHAIN_CLEANER_EXIT_ENV} is set: ignoring it. "
+                    "It is impossible to differentiate whether it's a true error or not."
                 )
-                pass
             else:
                 # here, proper handling
                 error_message = f"chain cleaner process died with the following error message: {stderr}"
+                if IS_MACOS:
+                    error_message += (
+                        f"\nOn macOS, chain cleaner always returns non-zero code: "
+                        f"set {Constants.IGNORE_MACOS_CHAIN_CLEANER_EXIT_ENV}=1 to ignore it"
+                    )
                 raise PipelineSubprocessError(error_message)
 
     to_log(f"Not filtered by score chains temporary saved to {_intermediate_chain}")
+    _output_chain_gz = f"{_output_chain}.gz"
     filter_cmd = [executables.chain_filter, f"-minScore={params.chain_min_score}", _intermediate_chain]
-    with open(_output_chain, "w") as f:
-        filter_process = subprocess.Popen(filter_cmd,
-                                          stdout=subprocess.PIPE,
-                                          stderr=subprocess.PIPE,
-                                          text=True)
-        stdout, stderr = filter_process.communicate()
-        f.write(stdout)
-        if filter_process.returncode != 0:
-            raise PipelineSubprocessError(f"Failed the filter command: {filter_cmd}")
+    # pigz compresses in parallel, fall back to gzip if it is not installed
+    gzip_cmd = get_compress_cmd(executables.pigz)
 
-    os.remove(_intermediate_chain)
-    to_log(f"Chain clean results saved to: {_output_chain}")
+    to_log("Executing the following sequence of piped commands:")
+    to_log(filter_cmd)
+    to_log(gzip_cmd)
+
+    # compress filtered chains on the fly: the uncompressed chain never hits the disk
+    filter_process = subprocess.Popen(filter_cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    with open(_output_chain_gz, "wb") as f:
+        gzip_process = subprocess.Popen(gzip_cmd, stdin=filter_process.stdout, stdout=f)
+    filter_process.stdout.close()
 
-    gzip_cmd = ["gzip", _output_chain]
     try:
-        subprocess.check_call(gzip_cmd)
-    except subprocess.CalledProcessError:
-        raise PipelineSubprocessError("gzip command at clean chain step failed")
+        _, filter_stderr = filter_process.communicate()
+    finally:
+        gzip_exit_code = gzip_process.wait()
+
+    # check the compressor first: if it died, chainFilter gets SIGPIPE
+    # and would be blamed for the compressor failure
+    if gzip_exit_code != 0 or filter_process.returncode != 0:
+        os.remove(_output_chain_gz) if os.path.isfile(_output_chain_gz) else None
+    if gzip_exit_code != 0:
+        raise PipelineSubprocessError(
+            f"{gzip_cmd[0]} command at clean chain step failed with exit code {gzip_exit_code}"
+        )
+    if filter_process.returncode != 0:
+        raise PipelineSubprocessError(
+            f"Failed the filter command: {filter_cmd}\n"
+            f"Error message: {filter_stderr.decode('utf-8')}"
+        )
+
+    os.remove(_intermediate_chain)
+    to_log(f"Chain clean results saved to: {_output_chain_gz}")
 
-    _output_chain_gz = f"{_output_chain}.gz"
     check_expected_file(_output_chain_gz, "clean_chain")
     to_log("Chain clean DONE")